@@ -3,7 +3,7 @@ import socket
 import warnings
 from collections import defaultdict
 from contextlib import suppress
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
 
 import aiohttp
 import discord
@@ -27,6 +27,15 @@ class StartupError(Exception):
         self.exception = base
 
 
+class FilterListItem(NamedTuple):
+    """An item of a filter list, as stored in the bot's `filter_list_cache` under its content."""
+
+    id: int
+    comment: Optional[str]
+    created_at: str
+    updated_at: str
+
+
 class Bot(commands.Bot):
     """A subclass of `discord.ext.commands.Bot` with an aiohttp session and an API client."""
 
@@ -43,6 +52,8 @@ class Bot(commands.Bot):
         self.redis_session = redis_session
         self.api_client: Optional[api.APIClient] = None
         self.filter_list_cache = defaultdict(dict)
+        # Bumped on every change to `filter_list_cache`, so anything derived from it knows when to rebuild.
+        self.filter_list_cache_version = 0
 
         self._connector = None
         self._resolver = None
@@ -216,12 +227,22 @@ class Bot(commands.Bot):
         allowed = item["allowed"]
         content = item["content"]
 
-        self.filter_list_cache[f"{type_}.{allowed}"][content] = {
-            "id": item["id"],
-            "comment": item["comment"],
-            "created_at": item["created_at"],
-            "updated_at": item["updated_at"],
-        }
+        # Attachment extensions are lowercased before they're compared against file formats.
+        if type_ == "FILE_FORMAT":
+            content = content.lower()
+
+        self.filter_list_cache[f"{type_}.{allowed}"][content] = FilterListItem(
+            id=item["id"],
+            comment=item["comment"],
+            created_at=item["created_at"],
+            updated_at=item["updated_at"],
+        )
+        self.filter_list_cache_version += 1
+
+    def remove_item_from_filter_list_cache(self, list_type: str, allowed: bool, content: str) -> None:
+        """Remove an item from the bots filter_list_cache."""
+        del self.filter_list_cache[f"{list_type}.{allowed}"][content]
+        self.filter_list_cache_version += 1
 
     async def login(self, *args, **kwargs) -> None:
         """Re-create the connector and set up sessions before logging into Discord."""
@@ -709,6 +709,10 @@ MODERATION_ROLES = Guild.moderation_roles
 STAFF_ROLES = Guild.staff_roles
 STAFF_PARTNERS_COMMUNITY_ROLES = STAFF_ROLES + [Roles.partners, Roles.python_community]
 
+# Role combinations as sets, for checking a member's roles against them
+MODERATION_ROLES_SET = frozenset(MODERATION_ROLES)
+STAFF_ROLES_SET = frozenset(STAFF_ROLES)
+
 # Channel combinations
 MODERATION_CHANNELS = Guild.moderation_channels
 
@@ -108,6 +108,27 @@ def has_no_roles(*roles: t.Union[str, int]) -> t.Callable:
     return commands.check(predicate)
 
 
+def has_any_role_id(*role_ids: int) -> t.Callable:
+    """
+    Returns True if the user has any of the roles specified.
+
+    `role_ids` are the IDs of the allowed roles. Unlike `commands.has_any_role`, roles can't be given by name,
+    which lets the author's roles be checked with a single set lookup each.
+    """
+    role_ids = frozenset(role_ids)
+
+    async def predicate(ctx: Context) -> bool:
+        if ctx.guild is None:
+            raise commands.NoPrivateMessage()
+
+        if role_ids.isdisjoint(role.id for role in ctx.author.roles):
+            raise commands.MissingAnyRole(list(role_ids))
+
+        return True
+
+    return commands.check(predicate)
+
+
 def redirect_output(
     destination_channel: int,
     bypass_roles: t.Optional[t.Container[int]] = None,
@@ -6,7 +6,7 @@ from sentry_sdk import push_scope
 
 from bot.api import ResponseCodeError
 from bot.bot import Bot
-from bot.constants import Colours, Icons, MODERATION_ROLES
+from bot.constants import Colours, Icons, MODERATION_ROLES_SET
 from bot.errors import InvalidInfractedUserError, LockedResourceError
 from bot.log import get_logger
 from bot.utils.checks import ContextCheckFailure
@@ -176,7 +176,7 @@ class ErrorHandler(Cog):
         if await ctx.invoke(tags_get_command, argument_string=ctx.message.content):
             return
 
-        if not any(role.id in MODERATION_ROLES for role in ctx.author.roles):
+        if MODERATION_ROLES_SET.isdisjoint(role.id for role in ctx.author.roles):
             await self.send_command_suggestion(ctx, ctx.invoked_with)
 
     async def send_command_suggestion(self, ctx: Context, command_name: str) -> None:
@@ -41,8 +41,9 @@ class AntiMalware(Cog):
 
     def _get_disallowed_extensions(self, message: Message) -> t.Iterable[str]:
         """Get an iterable containing all the disallowed extensions of attachments."""
+        whitelisted_file_formats = self._get_whitelisted_file_formats()
         file_extensions = {splitext(attachment.filename.lower())[1] for attachment in message.attachments}
-        extensions_blocked = file_extensions - set(self._get_whitelisted_file_formats())
+        extensions_blocked = {extension for extension in file_extensions if extension not in whitelisted_file_formats}
         return extensions_blocked
 
     @Cog.listener()
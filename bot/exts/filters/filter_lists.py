@@ -70,8 +70,11 @@ class FilterLists(Cog):
                 comment = guild_data.get("name")
 
         # If it's a file format, let's make sure it has a leading dot.
-        elif list_type == "FILE_FORMAT" and not content.startswith("."):
-            content = f".{content}"
+        # It's also lowercased, so that case variants of a format can't be stored separately.
+        elif list_type == "FILE_FORMAT":
+            content = content.lower()
+            if not content.startswith("."):
+                content = f".{content}"
 
         # If it's a filter token, validate the passed regex
         elif list_type == "FILTER_TOKEN":
@@ -134,8 +137,11 @@ class FilterLists(Cog):
             content = guild_data.get("id")
 
         # If it's a file format, let's make sure it has a leading dot.
-        elif list_type == "FILE_FORMAT" and not content.startswith("."):
-            content = f".{content}"
+        # File formats are cached lowercased, so look it up the same way.
+        elif list_type == "FILE_FORMAT":
+            content = content.lower()
+            if not content.startswith("."):
+                content = f".{content}"
 
         # Find the content and delete it.
         log.trace(f"Trying to delete the {content} item from the {list_type} {allow_type}")
@@ -144,13 +150,13 @@ class FilterLists(Cog):
         if item is not None:
             try:
                 await self.bot.api_client.delete(
-                    f"bot/filter-lists/{item['id']}"
+                    f"bot/filter-lists/{item.id}"
                 )
-                del self.bot.filter_list_cache[f"{list_type}.{allowed}"][content]
+                self.bot.remove_item_from_filter_list_cache(list_type, allowed, content)
                 await ctx.message.add_reaction("✅")
             except ResponseCodeError as e:
                 log.debug(
-                    f"{ctx.author} tried to delete an item with the id {item['id']}, but "
+                    f"{ctx.author} tried to delete an item with the id {item.id}, but "
                     f"the API raised an unexpected error: {e}"
                 )
                 await ctx.message.add_reaction("❌")
@@ -167,7 +173,7 @@ class FilterLists(Cog):
         for content, metadata in result.items():
             line = f"• `{content}`"
 
-            if comment := metadata.get("comment"):
+            if comment := metadata.comment:
                 line += f" - {comment}"
 
             lines.append(line)
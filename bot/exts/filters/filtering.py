@@ -1,6 +1,7 @@
 import asyncio
 import re
 import unicodedata
+import warnings
 from datetime import timedelta
 from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
 
@@ -17,7 +18,7 @@ from discord.ext.commands import Cog
 from discord.utils import escape_markdown
 
 from bot.api import ResponseCodeError
-from bot.bot import Bot
+from bot.bot import Bot, FilterListItem
 from bot.constants import Channels, Colours, Filter, Guild, Icons, URLs
 from bot.exts.events.code_jams._channels import CATEGORY_NAME as JAM_CATEGORY_NAME
 from bot.exts.moderation.modlog import ModLog
@@ -36,6 +37,9 @@ CODE_BLOCK_RE = re.compile(
 EVERYONE_PING_RE = re.compile(rf"@everyone|<@&{Guild.id}>|@here")
 SPOILER_RE = re.compile(r"(\|\|.+?\|\|)", re.DOTALL)
 URL_RE = re.compile(r"(https?://[^\s]+)", flags=re.IGNORECASE)
+# Parts of a pattern which change meaning once it's joined with other patterns:
+# global inline flags, numbered backreferences, and numbered conditional groups.
+UNCOMBINABLE_PATTERN_RE = re.compile(r"\(\?[aiLmsux]+\)|\\[1-9]|\(\?\(\d")
 
 # Exclude variation selectors from zalgo because they're actually invisible.
 VARIATION_SELECTORS = r"\uFE00-\uFE0F\U000E0100-\U000E01EF"
@@ -45,6 +49,8 @@ ZALGO_RE = regex.compile(rf"[\p{{NONSPACING MARK}}\p{{ENCLOSING MARK}}--[{VARIAT
 # Other constants.
 DAYS_BETWEEN_ALERTS = 3
 OFFENSIVE_MSG_DELETE_TIME = timedelta(days=Filter.offensive_msg_delete_days)
+CHANNEL_WHITELIST = frozenset(Filter.channel_whitelist)
+ROLE_WHITELIST = frozenset(Filter.role_whitelist)
 
 # Autoban
 LINK_PASSWORD = "https://support.discord.com/hc/en-us/articles/218410947-I-forgot-my-Password-Where-can-I-set-a-new-one"
@@ -150,6 +156,26 @@ class Filtering(Cog):
             },
         }
 
+        # Whether a filter is enabled is fixed by the config, so partition the filters
+        # once here instead of checking every filter for every message.
+        self.enabled_filters = {
+            filter_name: _filter for filter_name, _filter in self.filters.items() if _filter["enabled"]
+        }
+        self.enabled_content_filters = {
+            filter_name: _filter for filter_name, _filter in self.enabled_filters.items() if _filter["content_only"]
+        }
+
+        # Union of the `filter_token` patterns which can be combined, the patterns which have to be
+        # checked separately, and the `filter_list_cache` version these were built from.
+        self._watch_regex_union: Optional[re.Pattern] = None
+        self._watch_regex_separate: List[str] = []
+        self._watch_regex_union_version: Optional[int] = None
+
+        # Lowercased `domain_name` denylist entries with their trigram digests,
+        # and the `filter_list_cache` version these were built from.
+        self._domain_digests: List[Tuple[str, str, int]] = []
+        self._domain_digests_version: Optional[int] = None
+
         scheduling.create_task(self.reschedule_offensive_msg_deletion(), event_loop=self.bot.loop)
 
     def cog_unload(self) -> None:
@@ -160,10 +186,88 @@ class Filtering(Cog):
         """Fetch items from the filter_list_cache."""
         return self.bot.filter_list_cache[f"{list_type.upper()}.{allowed}"].keys()
 
-    def _get_filterlist_value(self, list_type: str, value: Any, *, allowed: bool) -> dict:
+    def _get_filterlist_value(self, list_type: str, value: Any, *, allowed: bool) -> FilterListItem:
         """Fetch one specific value from filter_list_cache."""
         return self.bot.filter_list_cache[f"{list_type.upper()}.{allowed}"][value]
 
+    def _update_watch_regex_union(self) -> None:
+        """
+        Combine the `filter_token` patterns into a single pattern, if the filter list cache changed since the last call.
+
+        Patterns which would change meaning once joined with others, such as ones using global inline flags
+        or numbered group references, are left out of the union and kept to be checked separately.
+        """
+        if self.bot.filter_list_cache_version == self._watch_regex_union_version:
+            return
+
+        patterns = list(self._get_filterlist_items('filter_token', allowed=False))
+        self._watch_regex_union_version = self.bot.filter_list_cache_version
+        self._watch_regex_union = None
+        self._watch_regex_separate = []
+
+        combinable = []
+        for pattern in patterns:
+            if UNCOMBINABLE_PATTERN_RE.search(pattern):
+                self._watch_regex_separate.append(pattern)
+            else:
+                combinable.append(pattern)
+
+        if not combinable:
+            return
+
+        try:
+            # Python 3.9 only warns about global flags which aren't at the start of a pattern,
+            # and then applies them to the whole union, so treat the warning as an error.
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", DeprecationWarning)
+                self._watch_regex_union = re.compile(
+                    "|".join(f"(?:{pattern})" for pattern in combinable),
+                    flags=re.IGNORECASE
+                )
+        except (re.error, DeprecationWarning) as e:
+            log.debug(f"Unable to combine the filter token patterns, checking them one by one: {e}")
+            self._watch_regex_separate = patterns
+
+    def _may_match_watch_regex(self, text: str) -> bool:
+        """
+        Return False if no `filter_token` pattern matches `text`, and True if one might.
+
+        This lets most texts be ruled out with one scan rather than one scan per pattern.
+        """
+        self._update_watch_regex_union()
+
+        if self._watch_regex_union is not None and self._watch_regex_union.search(text):
+            return True
+
+        return any(re.search(pattern, text, flags=re.IGNORECASE) for pattern in self._watch_regex_separate)
+
+    @staticmethod
+    def _trigram_digest(text: str) -> int:
+        """
+        Return a 64-bit digest with one bit set for each trigram of `text`.
+
+        If a string is a substring of `text`, the bits of its digest are a subset of the bits of `text`'s digest.
+        """
+        digest = 0
+        for i in range(len(text) - 2):
+            digest |= 1 << (hash(text[i:i + 3]) & 63)
+        return digest
+
+    def _get_domain_digests(self) -> List[Tuple[str, str, int]]:
+        """
+        Return each `domain_name` denylist entry with its lowercased form and its trigram digest.
+
+        The digests are only recomputed when the filter list cache changes.
+        """
+        if self.bot.filter_list_cache_version != self._domain_digests_version:
+            self._domain_digests_version = self.bot.filter_list_cache_version
+            self._domain_digests = [
+                (domain, domain.lower(), self._trigram_digest(domain.lower()))
+                for domain in self._get_filterlist_items("domain_name", allowed=False)
+            ]
+
+        return self._domain_digests
+
     @staticmethod
     def _expand_spoilers(text: str) -> str:
         """Return a string containing all interpretations of a spoilered message."""
@@ -216,6 +320,9 @@ class Filtering(Cog):
         # in case we have filters for one but not the other.
         names_to_check = (name, normalised_name, cleaned_normalised_name)
 
+        if not any(self._may_match_watch_regex(name_to_check) for name_to_check in names_to_check):
+            return None
+
         watchlist_patterns = self._get_filterlist_items('filter_token', allowed=False)
         for pattern in watchlist_patterns:
             for name in names_to_check:
@@ -278,29 +385,27 @@ class Filtering(Cog):
         filter_triggered = False
         # Should we filter this message?
         if self._check_filter(msg):
-            for filter_name, _filter in self.filters.items():
-                # Is this specific filter enabled in the config?
-                # We also do not need to worry about filters that take the full message,
-                # since all we have is an arbitrary string.
-                if _filter["enabled"] and _filter["content_only"]:
-                    filter_result = await _filter["function"](result)
-                    reason = None
-
-                    if isinstance(filter_result, tuple):
-                        match, reason = filter_result
-                    else:
-                        match = filter_result
+            # We do not need to worry about filters that take the full message,
+            # since all we have is an arbitrary string.
+            for filter_name, _filter in self.enabled_content_filters.items():
+                filter_result = await _filter["function"](result)
+                reason = None
+
+                if isinstance(filter_result, tuple):
+                    match, reason = filter_result
+                else:
+                    match = filter_result
 
-                    if match:
-                        # If this is a filter (not a watchlist), we set the variable so we know
-                        # that it has been triggered
-                        if _filter["type"] == "filter":
-                            filter_triggered = True
+                if match:
+                    # If this is a filter (not a watchlist), we set the variable so we know
+                    # that it has been triggered
+                    if _filter["type"] == "filter":
+                        filter_triggered = True
 
-                        stats = self._add_stats(filter_name, match, result)
-                        await self._send_log(filter_name, _filter, msg, stats, reason, is_eval=True)
+                    stats = self._add_stats(filter_name, match, result)
+                    await self._send_log(filter_name, _filter, msg, stats, reason, is_eval=True)
 
-                        break  # We don't want multiple filters to trigger
+                    break  # We don't want multiple filters to trigger
 
         return filter_triggered
 
@@ -308,102 +413,104 @@ class Filtering(Cog):
         """Filter the input message to see if it violates any of our rules, and then respond accordingly."""
         # Should we filter this message?
         if self._check_filter(msg):
-            for filter_name, _filter in self.filters.items():
-                # Is this specific filter enabled in the config?
-                if _filter["enabled"]:
-                    # Double trigger check for the embeds filter
-                    if filter_name == "watch_rich_embeds":
-                        # If the edit delta is less than 0.001 seconds, then we're probably dealing
-                        # with a double filter trigger.
-                        if delta is not None and delta < 100:
-                            continue
-
-                    if filter_name in ("filter_invites", "filter_everyone_ping"):
-                        # Disable invites filter in codejam team channels
-                        category = getattr(msg.channel, "category", None)
-                        if category and category.name == JAM_CATEGORY_NAME:
-                            continue
-
-                    # Does the filter only need the message content or the full message?
-                    if _filter["content_only"]:
-                        payload = msg.content
-                    else:
-                        payload = msg
-
-                    result = await _filter["function"](payload)
-                    reason = None
+            # Work out which filters don't apply to this message once, rather than for every filter.
+            skipped_filters = set()
+
+            # Double trigger check for the embeds filter.
+            # If the edit delta is less than 0.001 seconds, then we're probably dealing
+            # with a double filter trigger.
+            if delta is not None and delta < 100:
+                skipped_filters.add("watch_rich_embeds")
+
+            # Disable invites filter in codejam team channels
+            category = getattr(msg.channel, "category", None)
+            if category and category.name == JAM_CATEGORY_NAME:
+                skipped_filters.update(("filter_invites", "filter_everyone_ping"))
+
+            for filter_name, _filter in self.enabled_filters.items():
+                if filter_name in skipped_filters:
+                    continue
+
+                # Does the filter only need the message content or the full message?
+                if _filter["content_only"]:
+                    payload = msg.content
+                else:
+                    payload = msg
+
+                result = await _filter["function"](payload)
+                reason = None
 
-                    if isinstance(result, tuple):
-                        match, reason = result
-                    else:
-                        match = result
-
-                    if match:
-                        is_private = msg.channel.type is discord.ChannelType.private
-
-                        # If this is a filter (not a watchlist) and not in a DM, delete the message.
-                        if _filter["type"] == "filter" and not is_private:
-                            try:
-                                # Embeds (can?) trigger both the `on_message` and `on_message_edit`
-                                # event handlers, triggering filtering twice for the same message.
-                                #
-                                # If `on_message`-triggered filtering already deleted the message
-                                # then `on_message_edit`-triggered filtering will raise exception
-                                # since the message no longer exists.
-                                #
-                                # In addition, to avoid sending two notifications to the user, the
-                                # logs, and mod_alert, we return if the message no longer exists.
-                                await msg.delete()
-                            except discord.errors.NotFound:
-                                return
-
-                            # Notify the user if the filter specifies
-                            if _filter["user_notification"]:
-                                await self.notify_member(msg.author, _filter["notification_msg"], msg.channel)
-
-                        # If the message is classed as offensive, we store it in the site db and
-                        # it will be deleted after one week.
-                        if _filter["schedule_deletion"] and not is_private:
-                            delete_date = (msg.created_at + OFFENSIVE_MSG_DELETE_TIME).isoformat()
-                            data = {
-                                'id': msg.id,
-                                'channel_id': msg.channel.id,
-                                'delete_date': delete_date
-                            }
-
-                            try:
-                                await self.bot.api_client.post('bot/offensive-messages', json=data)
-                            except ResponseCodeError as e:
-                                if e.status == 400 and "already exists" in e.response_json.get("id", [""])[0]:
-                                    log.debug(f"Offensive message {msg.id} already exists.")
-                                else:
-                                    log.error(f"Offensive message {msg.id} failed to post: {e}")
+                if isinstance(result, tuple):
+                    match, reason = result
+                else:
+                    match = result
+
+                if match:
+                    is_private = msg.channel.type is discord.ChannelType.private
+
+                    # If this is a filter (not a watchlist) and not in a DM, delete the message.
+                    if _filter["type"] == "filter" and not is_private:
+                        try:
+                            # Embeds (can?) trigger both the `on_message` and `on_message_edit`
+                            # event handlers, triggering filtering twice for the same message.
+                            #
+                            # If `on_message`-triggered filtering already deleted the message
+                            # then `on_message_edit`-triggered filtering will raise exception
+                            # since the message no longer exists.
+                            #
+                            # In addition, to avoid sending two notifications to the user, the
+                            # logs, and mod_alert, we return if the message no longer exists.
+                            await msg.delete()
+                        except discord.errors.NotFound:
+                            return
+
+                        # Notify the user if the filter specifies
+                        if _filter["user_notification"]:
+                            await self.notify_member(msg.author, _filter["notification_msg"], msg.channel)
+
+                    # If the message is classed as offensive, we store it in the site db and
+                    # it will be deleted after one week.
+                    if _filter["schedule_deletion"] and not is_private:
+                        delete_date = (msg.created_at + OFFENSIVE_MSG_DELETE_TIME).isoformat()
+                        data = {
+                            'id': msg.id,
+                            'channel_id': msg.channel.id,
+                            'delete_date': delete_date
+                        }
+
+                        try:
+                            await self.bot.api_client.post('bot/offensive-messages', json=data)
+                        except ResponseCodeError as e:
+                            if e.status == 400 and "already exists" in e.response_json.get("id", [""])[0]:
+                                log.debug(f"Offensive message {msg.id} already exists.")
                             else:
-                                self.schedule_msg_delete(data)
-                                log.trace(f"Offensive message {msg.id} will be deleted on {delete_date}")
-
-                        stats = self._add_stats(filter_name, match, msg.content)
-                        await self._send_log(filter_name, _filter, msg, stats, reason)
-
-                        # If the filter reason contains `[autoban]`, we want to auto-ban the user
-                        if reason and "[autoban]" in reason.lower():
-                            # Create a new context, with the author as is the bot, and the channel as #mod-alerts.
-                            # This sends the ban confirmation directly under watchlist trigger embed, to inform
-                            # mods that the user was auto-banned for the message.
-                            context = await self.bot.get_context(msg)
-                            context.guild = self.bot.get_guild(Guild.id)
-                            context.author = context.guild.get_member(self.bot.user.id)
-                            context.channel = self.bot.get_channel(Channels.mod_alerts)
-                            context.command = self.bot.get_command("tempban")
-
-                            await context.invoke(
-                                context.command,
-                                msg.author,
-                                arrow.utcnow() + AUTO_BAN_DURATION,
-                                reason=AUTO_BAN_REASON
-                            )
-
-                        break  # We don't want multiple filters to trigger
+                                log.error(f"Offensive message {msg.id} failed to post: {e}")
+                        else:
+                            self.schedule_msg_delete(data)
+                            log.trace(f"Offensive message {msg.id} will be deleted on {delete_date}")
+
+                    stats = self._add_stats(filter_name, match, msg.content)
+                    await self._send_log(filter_name, _filter, msg, stats, reason)
+
+                    # If the filter reason contains `[autoban]`, we want to auto-ban the user
+                    if reason and "[autoban]" in reason.lower():
+                        # Create a new context, with the author as is the bot, and the channel as #mod-alerts.
+                        # This sends the ban confirmation directly under watchlist trigger embed, to inform
+                        # mods that the user was auto-banned for the message.
+                        context = await self.bot.get_context(msg)
+                        context.guild = self.bot.get_guild(Guild.id)
+                        context.author = context.guild.get_member(self.bot.user.id)
+                        context.channel = self.bot.get_channel(Channels.mod_alerts)
+                        context.command = self.bot.get_command("tempban")
+
+                        await context.invoke(
+                            context.command,
+                            msg.author,
+                            arrow.utcnow() + AUTO_BAN_DURATION,
+                            reason=AUTO_BAN_REASON
+                        )
+
+                    break  # We don't want multiple filters to trigger
 
     async def _send_log(
         self,
@@ -495,17 +602,15 @@ class Filtering(Cog):
     @staticmethod
     def _check_filter(msg: Message) -> bool:
         """Check whitelists to see if we should filter this message."""
-        role_whitelisted = False
-
-        if type(msg.author) is Member:  # Only Member has roles, not User.
-            for role in msg.author.roles:
-                if role.id in Filter.role_whitelist:
-                    role_whitelisted = True
+        role_whitelisted = (
+            type(msg.author) is Member  # Only Member has roles, not User.
+            and not ROLE_WHITELIST.isdisjoint(role.id for role in msg.author.roles)
+        )
 
         return (
-            msg.channel.id not in Filter.channel_whitelist  # Channel not in whitelist
-            and not role_whitelisted                        # Role not in whitelist
-            and not msg.author.bot                          # Author not a bot
+            msg.channel.id not in CHANNEL_WHITELIST  # Channel not in whitelist
+            and not role_whitelisted                 # Role not in whitelist
+            and not msg.author.bot                   # Author not a bot
         )
 
     async def _has_watch_regex_match(self, text: str) -> Tuple[Union[bool, re.Match], Optional[str]]:
@@ -521,11 +626,14 @@ class Filtering(Cog):
 
         text = self.clean_input(text)
 
+        if not self._may_match_watch_regex(text):
+            return False, None
+
         watchlist_patterns = self._get_filterlist_items('filter_token', allowed=False)
         for pattern in watchlist_patterns:
             match = re.search(pattern, text, flags=re.IGNORECASE)
             if match:
-                return match, self._get_filterlist_value('filter_token', pattern, allowed=False)['comment']
+                return match, self._get_filterlist_value('filter_token', pattern, allowed=False).comment
 
         return False, None
 
@@ -537,14 +645,27 @@ class Filtering(Cog):
         """
         text = self.clean_input(text)
 
-        domain_blacklist = self._get_filterlist_items("domain_name", allowed=False)
+        domain_blacklist = None
         for match in URL_RE.finditer(text):
-            for url in domain_blacklist:
-                if url.lower() in match.group(1).lower():
-                    blacklisted_parsed = tldextract.extract(url.lower())
-                    url_parsed = tldextract.extract(match.group(1).lower())
+            # Only look at the denylist once the text is known to contain a URL.
+            if domain_blacklist is None:
+                domain_blacklist = self._get_domain_digests()
+
+            match_url = match.group(1).lower()
+            match_digest = self._trigram_digest(match_url)
+            url_parsed = None
+
+            for url, url_lower, url_digest in domain_blacklist:
+                # A trigram of the denylisted domain is missing, so it can't be part of the URL.
+                if url_digest & ~match_digest:
+                    continue
+
+                if url_lower in match_url:
+                    blacklisted_parsed = tldextract.extract(url_lower)
+                    if url_parsed is None:
+                        url_parsed = tldextract.extract(match_url)
                     if blacklisted_parsed.registered_domain == url_parsed.registered_domain:
-                        return True, self._get_filterlist_value("domain_name", url, allowed=False)["comment"]
+                        return True, self._get_filterlist_value("domain_name", url, allowed=False).comment
         return False, None
 
     @staticmethod
@@ -606,7 +727,7 @@ class Filtering(Cog):
             if invite_not_allowed:
                 reason = None
                 if guild_id in guild_invite_blacklist:
-                    reason = self._get_filterlist_value("guild_invite", guild_id, allowed=False)["comment"]
+                    reason = self._get_filterlist_value("guild_invite", guild_id, allowed=False).comment
 
                 guild_icon_hash = guild["icon"]
                 guild_icon = (
@@ -10,7 +10,7 @@ from discord.ext.commands import Cog, Context, command
 
 from bot.api import ResponseCodeError
 from bot.bot import Bot
-from bot.constants import Channels, MODERATION_ROLES, Roles, VoiceGate as GateConf
+from bot.constants import Channels, MODERATION_ROLES_SET, Roles, VoiceGate as GateConf
 from bot.decorators import has_no_roles, in_whitelist
 from bot.exts.moderation.modlog import ModLog
 from bot.log import get_logger
@@ -233,7 +233,7 @@ class VoiceGate(Cog):
                 return
 
         # Then check is member moderator+, because we don't want to delete their messages.
-        if any(role.id in MODERATION_ROLES for role in message.author.roles) and is_verify_command is False:
+        if not MODERATION_ROLES_SET.isdisjoint(role.id for role in message.author.roles) and is_verify_command is False:
             log.trace(f"Excluding moderator message {message.id} from deletion in #{message.channel}.")
             return
 
@@ -3,12 +3,14 @@ from collections import ChainMap
 
 from discord.ext.commands import Cog, Context, group, has_any_role
 
+from bot.api import ResponseCodeError
 from bot.bot import Bot
-from bot.constants import Channels, MODERATION_ROLES, Webhooks
+from bot.constants import Channels, MODERATION_ROLES, MODERATION_ROLES_SET, Webhooks
 from bot.converters import MemberOrUser
 from bot.exts.moderation.infraction._utils import post_infraction
 from bot.exts.moderation.watchchannels._watchchannel import WatchChannel
 from bot.log import get_logger
+from bot.utils import scheduling
 
 log = get_logger(__name__)
 
@@ -95,17 +97,14 @@ class BigBrother(WatchChannel, Cog, name="Big Brother"):
             return
 
         # discord.User instances don't have a roles attribute
-        if hasattr(user, "roles") and any(role.id in MODERATION_ROLES for role in user.roles):
+        if hasattr(user, "roles") and not MODERATION_ROLES_SET.isdisjoint(role.id for role in user.roles):
             await ctx.send(f":x: I'm sorry {ctx.author}, I'm afraid I can't do that. I must be kind to my masters.")
             return
 
-        response = await post_infraction(ctx, user, 'watch', reason, hidden=True, active=True)
-
-        if response is not None:
-            self.watched_users[user.id] = response
-            msg = f":white_check_mark: Messages sent by {user.mention} will now be relayed to Big Brother."
-
-            history = await self.bot.api_client.get(
+        # The previous, inactive watches don't depend on the new infraction, so start fetching them now.
+        # API errors are handled when the task is awaited, so they don't need logging by the task itself.
+        history_task = scheduling.create_task(
+            self.bot.api_client.get(
                 self.api_endpoint,
                 params={
                     "user__id": str(user.id),
@@ -113,7 +112,27 @@ class BigBrother(WatchChannel, Cog, name="Big Brother"):
                     'type': 'watch',
                     'ordering': '-inserted_at'
                 }
-            )
+            ),
+            suppressed_exceptions=(ResponseCodeError,),
+            name=f"bigbrother-watch-history-{user.id}"
+        )
+
+        try:
+            response = await post_infraction(ctx, user, 'watch', reason, hidden=True, active=True)
+        except Exception:
+            history_task.cancel()
+            raise
+
+        if response is not None:
+            self.watched_users[user.id] = response
+            msg = f":white_check_mark: Messages sent by {user.mention} will now be relayed to Big Brother."
+
+            try:
+                history = await history_task
+            except ResponseCodeError as e:
+                # The watch was applied; only the previous reasons can't be shown.
+                log.warning(f"Failed to fetch the watch history of {user}: {e}")
+                history = []
 
             if len(history) > 1:
                 total = f"({len(history) // 2} previous infractions in total)"
@@ -121,6 +140,7 @@ class BigBrother(WatchChannel, Cog, name="Big Brother"):
                 start_reason = f"Watched: {textwrap.shorten(history[1]['reason'], width=500, placeholder='...')}"
                 msg += f"\n\nUser's previous watch reasons {total}:```{start_reason}\n\n{end_reason}```"
         else:
+            history_task.cancel()
             msg = ":x: Failed to post the infraction: response was empty."
 
         await ctx.send(msg)
@@ -1,17 +1,21 @@
-import textwrap
-from collections import ChainMap, defaultdict
+import asyncio
+from collections import defaultdict
+from functools import cached_property
 from io import StringIO
 from typing import Optional, Union
 
 import discord
 from async_rediscache import RedisCache
 from discord import Color, Embed, Member, PartialMessage, RawReactionActionEvent, User
-from discord.ext.commands import BadArgument, Cog, Context, group, has_any_role
+from discord.ext.commands import BadArgument, Cog, Context, group
 
 from bot.api import ResponseCodeError
 from bot.bot import Bot
-from bot.constants import Channels, Emojis, Guild, MODERATION_ROLES, Roles, STAFF_ROLES
+from bot.constants import (
+    Channels, Emojis, Guild, MODERATION_ROLES, MODERATION_ROLES_SET, Roles, STAFF_ROLES, STAFF_ROLES_SET
+)
 from bot.converters import MemberOrUser, UnambiguousMemberOrUser
+from bot.decorators import has_any_role_id
 from bot.exts.recruitment.talentpool._review import Reviewer
 from bot.log import get_logger
 from bot.pagination import LinePaginator
@@ -40,6 +44,11 @@ class TalentPool(Cog, name="Talentpool"):
         self.initial_refresh_task = scheduling.create_task(self.refresh_cache(), event_loop=self.bot.loop)
         scheduling.create_task(self.schedule_autoreviews(), event_loop=self.bot.loop)
 
+    @cached_property
+    def _nominations_url(self) -> str:
+        """The full URL of the nominations endpoint, for requests made directly through the API session."""
+        return self.bot.api_client._url_for('bot/nominations')
+
     async def schedule_autoreviews(self) -> None:
         """Reschedule reviews for active nominations if autoreview is enabled."""
         if await self.autoreview_enabled():
@@ -75,19 +84,19 @@ class TalentPool(Cog, name="Talentpool"):
         return True
 
     @group(name='talentpool', aliases=('tp', 'talent', 'nomination', 'n'), invoke_without_command=True)
-    @has_any_role(*STAFF_ROLES)
+    @has_any_role_id(*STAFF_ROLES)
     async def nomination_group(self, ctx: Context) -> None:
         """Highlights the activity of helper nominees by relaying their messages to the talent pool channel."""
         await ctx.send_help(ctx.command)
 
     @nomination_group.group(name="autoreview", aliases=("ar",), invoke_without_command=True)
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def nomination_autoreview_group(self, ctx: Context) -> None:
         """Commands for enabling or disabling autoreview."""
         await ctx.send_help(ctx.command)
 
     @nomination_autoreview_group.command(name="enable", aliases=("on",))
-    @has_any_role(Roles.admins)
+    @has_any_role_id(Roles.admins)
     async def autoreview_enable(self, ctx: Context) -> None:
         """
         Enable automatic posting of reviews.
@@ -104,7 +113,7 @@ class TalentPool(Cog, name="Talentpool"):
         await ctx.send(":white_check_mark: Autoreview enabled")
 
     @nomination_autoreview_group.command(name="disable", aliases=("off",))
-    @has_any_role(Roles.admins)
+    @has_any_role_id(Roles.admins)
     async def autoreview_disable(self, ctx: Context) -> None:
         """Disable automatic posting of reviews."""
         if not await self.autoreview_enabled():
@@ -116,7 +125,7 @@ class TalentPool(Cog, name="Talentpool"):
         await ctx.send(":white_check_mark: Autoreview disabled")
 
     @nomination_autoreview_group.command(name="status")
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def autoreview_status(self, ctx: Context) -> None:
         """Show whether automatic posting of reviews is enabled or disabled."""
         if await self.autoreview_enabled():
@@ -129,7 +138,7 @@ class TalentPool(Cog, name="Talentpool"):
         aliases=("nominated", "all", "list", "watched"),
         root_aliases=("nominees",)
     )
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def list_command(
         self,
         ctx: Context,
@@ -199,7 +208,7 @@ class TalentPool(Cog, name="Talentpool"):
         await LinePaginator.paginate(lines, ctx, embed, empty=False)
 
     @nomination_group.command(name='oldest')
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def oldest_command(self, ctx: Context, update_cache: bool = True) -> None:
         """
         Shows talent pool users ordered by oldest nomination.
@@ -214,7 +223,7 @@ class TalentPool(Cog, name="Talentpool"):
         aliases=("fw", "forceadd", "fa", "fn", "forcewatch"),
         root_aliases=("forcenominate",)
     )
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def force_nominate_command(self, ctx: Context, user: MemberOrUser, *, reason: str = '') -> None:
         """
         Adds the given `user` to the talent pool, from any channel.
@@ -224,7 +233,7 @@ class TalentPool(Cog, name="Talentpool"):
         await self._nominate_user(ctx, user, reason)
 
     @nomination_group.command(name='nominate', aliases=("w", "add", "a", "watch"), root_aliases=("nominate",))
-    @has_any_role(*STAFF_ROLES)
+    @has_any_role_id(*STAFF_ROLES)
     async def nominate_command(self, ctx: Context, user: MemberOrUser, *, reason: str = '') -> None:
         """
         Adds the given `user` to the talent pool.
@@ -233,7 +242,7 @@ class TalentPool(Cog, name="Talentpool"):
         This command can only be used in the `#nominations` channel.
         """
         if ctx.channel.id != Channels.nominations:
-            if any(role.id in MODERATION_ROLES for role in ctx.author.roles):
+            if not MODERATION_ROLES_SET.isdisjoint(role.id for role in ctx.author.roles):
                 await ctx.send(
                     f":x: Nominations should be run in the <#{Channels.nominations}> channel. "
                     "Use `!tp forcenominate` to override this check."
@@ -250,7 +259,7 @@ class TalentPool(Cog, name="Talentpool"):
             await ctx.send(f":x: I'm sorry {ctx.author}, I'm afraid I can't do that. Only humans can be nominated.")
             return
 
-        if isinstance(user, Member) and any(role.id in STAFF_ROLES for role in user.roles):
+        if isinstance(user, Member) and not STAFF_ROLES_SET.isdisjoint(role.id for role in user.roles):
             await ctx.send(":x: Nominating staff members, eh? Here's a cookie :cookie:")
             return
 
@@ -264,7 +273,7 @@ class TalentPool(Cog, name="Talentpool"):
 
         # Manual request with `raise_for_status` as False because we want the actual response
         session = self.bot.api_client.session
-        url = self.bot.api_client._url_for('bot/nominations')
+        url = self._nominations_url
         kwargs = {
             'json': {
                 'actor': ctx.author.id,
@@ -274,17 +283,18 @@ class TalentPool(Cog, name="Talentpool"):
             'raise_for_status': False,
         }
         async with session.post(url, **kwargs) as resp:
-            response_data = await resp.json()
-
             if resp.status == 400:
+                response_data = await resp.json()
                 if response_data.get('user', False):
                     await ctx.send(":x: The specified user can't be found in the database tables")
                 elif response_data.get('actor', False):
                     await ctx.send(":x: You have already nominated this user")
 
                 return
-            else:
-                resp.raise_for_status()
+
+            # Raise before parsing, as other error responses may not have a JSON body.
+            resp.raise_for_status()
+            response_data = await resp.json()
 
         self.cache[user.id] = response_data
 
@@ -296,7 +306,7 @@ class TalentPool(Cog, name="Talentpool"):
         await ctx.send(msg)
 
     @nomination_group.command(name='history', aliases=('info', 'search'))
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def history_command(self, ctx: Context, user: MemberOrUser) -> None:
         """Shows the specified user's nomination history."""
         result = await self.bot.api_client.get(
@@ -314,7 +324,7 @@ class TalentPool(Cog, name="Talentpool"):
             title=f"Nominations for {user.display_name} `({user.id})`",
             color=Color.blue()
         )
-        lines = [await self._nomination_to_string(nomination) for nomination in result]
+        lines = await self._render_nominations(result)
         await LinePaginator.paginate(
             lines,
             ctx=ctx,
@@ -325,7 +335,7 @@ class TalentPool(Cog, name="Talentpool"):
         )
 
     @nomination_group.command(name="end", aliases=("unwatch", "unnominate"), root_aliases=("unnominate",))
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def end_nomination_command(self, ctx: Context, user: MemberOrUser, *, reason: str) -> None:
         """
         Ends the active nomination of the specified user with the given reason.
@@ -342,13 +352,13 @@ class TalentPool(Cog, name="Talentpool"):
             await ctx.send(":x: The specified user does not have an active nomination")
 
     @nomination_group.group(name='edit', aliases=('e',), invoke_without_command=True)
-    @has_any_role(*STAFF_ROLES)
+    @has_any_role_id(*STAFF_ROLES)
     async def nomination_edit_group(self, ctx: Context) -> None:
         """Commands to edit nominations."""
         await ctx.send_help(ctx.command)
 
     @nomination_edit_group.command(name='reason')
-    @has_any_role(*STAFF_ROLES)
+    @has_any_role_id(*STAFF_ROLES)
     async def edit_reason_command(
         self,
         ctx: Context,
@@ -372,7 +382,7 @@ class TalentPool(Cog, name="Talentpool"):
         # If not specified, assume the invoker is editing their own nomination reason.
         nominator = nominator or ctx.author
 
-        if not any(role.id in MODERATION_ROLES for role in ctx.author.roles):
+        if MODERATION_ROLES_SET.isdisjoint(role.id for role in ctx.author.roles):
             if ctx.channel.id != Channels.nominations:
                 await ctx.send(f":x: Nomination edits must be run in the <#{Channels.nominations}> channel")
                 return
@@ -436,11 +446,13 @@ class TalentPool(Cog, name="Talentpool"):
             f"bot/nominations/{nomination_id}",
             json={"actor": actor.id, "reason": reason}
         )
-        await self.refresh_cache()  # Update cache
-        await ctx.send(":white_check_mark: Successfully updated nomination reason.")
+        await asyncio.gather(
+            self.refresh_cache(),  # Update cache
+            ctx.send(":white_check_mark: Successfully updated nomination reason."),
+        )
 
     @nomination_edit_group.command(name='end_reason')
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def edit_end_reason_command(self, ctx: Context, nomination_id: int, *, reason: str) -> None:
         """Edits the unnominate reason for the nomination with the given `id`."""
         if len(reason) > REASON_MAX_CHARS:
@@ -467,11 +479,13 @@ class TalentPool(Cog, name="Talentpool"):
             f"bot/nominations/{nomination_id}",
             json={"end_reason": reason}
         )
-        await self.refresh_cache()  # Update cache.
-        await ctx.send(":white_check_mark: Updated the end reason of the nomination!")
+        await asyncio.gather(
+            self.refresh_cache(),  # Update cache.
+            ctx.send(":white_check_mark: Updated the end reason of the nomination!"),
+        )
 
     @nomination_group.command(aliases=('mr',))
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def mark_reviewed(self, ctx: Context, user_id: int) -> None:
         """Mark a user's nomination as reviewed and cancel the review task."""
         if not await self.reviewer.mark_reviewed(ctx, user_id):
@@ -479,7 +493,7 @@ class TalentPool(Cog, name="Talentpool"):
         await ctx.send(f"{Emojis.check_mark} The user with ID `{user_id}` was marked as reviewed.")
 
     @nomination_group.command(aliases=('gr',))
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def get_review(self, ctx: Context, user_id: int) -> None:
         """Get the user's review as a markdown file."""
         review, _, _ = await self.reviewer.make_review(user_id)
@@ -487,7 +501,7 @@ class TalentPool(Cog, name="Talentpool"):
         await ctx.send(file=file)
 
     @nomination_group.command(aliases=('review',))
-    @has_any_role(*MODERATION_ROLES)
+    @has_any_role_id(*MODERATION_ROLES)
     async def post_review(self, ctx: Context, user_id: int) -> None:
         """Post the automatic review for the user ahead of time."""
         if not await self.reviewer.mark_reviewed(ctx, user_id):
@@ -499,6 +513,10 @@ class TalentPool(Cog, name="Talentpool"):
     @Cog.listener()
     async def on_member_ban(self, guild: Guild, user: MemberOrUser) -> None:
         """Remove `user` from the talent pool after they are banned."""
+        # Most banned users were never nominated, so avoid querying the API for them.
+        if self.cache is not None and user.id not in self.cache:
+            return
+
         await self.end_nomination(user.id, "User was banned.")
 
     @Cog.listener()
@@ -528,10 +546,7 @@ class TalentPool(Cog, name="Talentpool"):
         """End the active nomination of a user with the given reason and return True on success."""
         active_nomination = await self.bot.api_client.get(
             'bot/nominations',
-            params=ChainMap(
-                {"user__id": str(user_id)},
-                self.api_default_params,
-            )
+            params={**self.api_default_params, "user__id": str(user_id)}
         )
 
         if not active_nomination:
@@ -552,13 +567,28 @@ class TalentPool(Cog, name="Talentpool"):
 
         return True
 
-    async def _nomination_to_string(self, nomination_object: dict) -> str:
-        """Creates a string representation of a nomination."""
+    async def _render_nominations(self, nominations: list[dict]) -> list[str]:
+        """Creates a string representation of each of the given nominations."""
         guild = self.bot.get_guild(Guild.id)
+
+        # Resolve each distinct actor across all nominations once, fetching any uncached members concurrently.
+        actor_ids = list({
+            site_entry["actor"]
+            for nomination in nominations
+            for site_entry in nomination["entries"]
+        })
+        members = await asyncio.gather(*(get_or_fetch_member(guild, actor_id) for actor_id in actor_ids))
+        actors = dict(zip(actor_ids, members))
+
+        return [self._nomination_to_string(nomination, actors) for nomination in nominations]
+
+    @staticmethod
+    def _nomination_to_string(nomination_object: dict, actors: dict[int, Optional[Member]]) -> str:
+        """Creates a string representation of a nomination, with its actors resolved through `actors`."""
         entries = []
         for site_entry in nomination_object["entries"]:
             actor_id = site_entry["actor"]
-            actor = await get_or_fetch_member(guild, actor_id)
+            actor = actors[actor_id]
 
             reason = site_entry["reason"] or "*None*"
             created = time.discord_timestamp(site_entry["inserted_at"])
@@ -572,35 +602,31 @@ class TalentPool(Cog, name="Talentpool"):
 
         start_date = time.discord_timestamp(nomination_object["inserted_at"])
         if active:
-            lines = textwrap.dedent(
-                f"""
-                ===============
-                Status: **Active**
-                Date: {start_date}
-                Nomination ID: `{nomination_object["id"]}`
-
-                {entries_string}
-                ===============
-                """
+            lines = (
+                "===============\n"
+                "Status: **Active**\n"
+                f"Date: {start_date}\n"
+                f"Nomination ID: `{nomination_object['id']}`\n"
+                "\n"
+                f"{entries_string}\n"
+                "==============="
             )
         else:
             end_date = time.discord_timestamp(nomination_object["ended_at"])
-            lines = textwrap.dedent(
-                f"""
-                ===============
-                Status: Inactive
-                Date: {start_date}
-                Nomination ID: `{nomination_object["id"]}`
-
-                {entries_string}
-
-                End date: {end_date}
-                Unnomination reason: {nomination_object["end_reason"]}
-                ===============
-                """
+            lines = (
+                "===============\n"
+                "Status: Inactive\n"
+                f"Date: {start_date}\n"
+                f"Nomination ID: `{nomination_object['id']}`\n"
+                "\n"
+                f"{entries_string}\n"
+                "\n"
+                f"End date: {end_date}\n"
+                f"Unnomination reason: {nomination_object['end_reason']}\n"
+                "==============="
             )
 
-        return lines.strip()
+        return lines
 
     def cog_unload(self) -> None:
         """Cancels all review tasks on cog unload."""
@@ -9,7 +9,7 @@ import discord
 from discord.ext.commands import Context
 
 import bot
-from bot.constants import Emojis, MODERATION_ROLES, NEGATIVE_REPLIES
+from bot.constants import Emojis, MODERATION_ROLES_SET, NEGATIVE_REPLIES
 from bot.log import get_logger
 from bot.utils import scheduling
 
@@ -41,7 +41,7 @@ def reaction_check(
 
     is_moderator = (
         allow_mods
-        and any(role.id in MODERATION_ROLES for role in getattr(user, "roles", []))
+        and not MODERATION_ROLES_SET.isdisjoint(role.id for role in getattr(user, "roles", []))
     )
 
     if user.id in allowed_users or is_moderator:
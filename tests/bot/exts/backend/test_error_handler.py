@@ -369,7 +369,7 @@ class TryGetTagTests(unittest.IsolatedAsyncioTestCase):
         await self.cog.try_get_tag(self.ctx)
         self.cog.send_command_suggestion.assert_not_awaited()
 
-    @patch("bot.exts.backend.error_handler.MODERATION_ROLES", new=[1234])
+    @patch("bot.exts.backend.error_handler.MODERATION_ROLES_SET", new=frozenset({1234}))
     async def test_dont_call_suggestion_if_user_mod(self):
         """Should not call command suggestion if user is a mod."""
         self.ctx.invoked_with = "foo"
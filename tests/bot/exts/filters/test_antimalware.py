@@ -1,8 +1,10 @@
 import unittest
+from collections import defaultdict
 from unittest.mock import AsyncMock, Mock
 
 from discord import NotFound
 
+from bot.bot import Bot
 from bot.constants import Channels, STAFF_ROLES
 from bot.exts.filters import antimalware
 from tests.helpers import MockAttachment, MockBot, MockMessage, MockRole
@@ -191,6 +193,28 @@ class AntiMalwareCogTests(unittest.IsolatedAsyncioTestCase):
                 disallowed_extensions = self.cog._get_disallowed_extensions(self.message)
                 self.assertCountEqual(disallowed_extensions, expected_disallowed_extensions)
 
+    def test_get_disallowed_extensions_with_uppercase_file_format(self):
+        """File formats added with uppercase characters should still allow matching attachments."""
+        self.bot.filter_list_cache = defaultdict(dict)
+        item = {
+            "id": 1,
+            "type": "FILE_FORMAT",
+            "allowed": True,
+            "content": ".PY",
+            "comment": None,
+            "created_at": "2021-01-01T00:00:00Z",
+            "updated_at": "2021-01-01T00:00:00Z",
+        }
+        Bot.insert_item_into_filter_list_cache(self.bot, item)
+
+        for filename in ("script.py", "SCRIPT.PY"):
+            with self.subTest(filename=filename):
+                self.message.attachments = [MockAttachment(filename=filename)]
+                self.assertCountEqual(self.cog._get_disallowed_extensions(self.message), [])
+
+        self.message.attachments = [MockAttachment(filename="script.txt")]
+        self.assertCountEqual(self.cog._get_disallowed_extensions(self.message), [".txt"])
+
 
 class AntiMalwareSetupTests(unittest.TestCase):
     """Tests setup of the `AntiMalware` cog."""
@@ -11,6 +11,7 @@ class FilteringCogTests(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         """Instantiate the bot and cog."""
         self.bot = MockBot()
+        self.bot.filter_list_cache_version = 0
         with patch("bot.utils.scheduling.create_task", new=lambda task, **_: task.close()):
             self.cog = filtering.Filtering(self.bot)
 
@@ -38,3 +39,119 @@ class FilteringCogTests(unittest.IsolatedAsyncioTestCase):
                 )
                 if result:
                     self.assertEqual("TOKEN", result.group())
+
+    @autospec(filtering.Filtering, "_get_filterlist_items")
+    async def test_token_filter_union(self, get_items):
+        """The combined filter token pattern should agree with matching each pattern individually."""
+        cases = (
+            (["TOKEN", "other"], "an OTHER token", "token"),
+            (["TOKEN", "other"], "something OTHER", "OTHER"),
+            (["TOKEN", "other"], "no matches", None),
+            ([r"(ab)\1", "other"], "xababx", "abab"),
+            ([r"(ab)\1", "other"], "xabx", None),
+            ([], "TOKEN", None),
+        )
+
+        for patterns, message, expected in cases:
+            with self.subTest(patterns=patterns, message=message):
+                get_items.return_value = patterns
+                self.bot.filter_list_cache_version += 1
+                result, _ = await self.cog._has_watch_regex_match(message)
+
+                if expected is None:
+                    self.assertFalse(result)
+                else:
+                    self.assertEqual(expected, result.group())
+
+    @autospec(filtering.Filtering, "_get_filterlist_items")
+    def test_uncombinable_patterns_checked_separately(self, get_items):
+        """Patterns which change meaning when joined should be left out of the combined pattern."""
+        cases = (
+            [r"(a)\1", "b"],
+            ["(?x)baz", "b"],
+            [r"(a)?(?(1)b|c)", "b"],
+        )
+
+        for patterns in cases:
+            with self.subTest(patterns=patterns):
+                get_items.return_value = patterns
+                self.bot.filter_list_cache_version += 1
+                self.cog._update_watch_regex_union()
+
+                self.assertEqual([patterns[0]], self.cog._watch_regex_separate)
+                self.assertIsNotNone(self.cog._watch_regex_union)
+
+    @autospec(filtering.Filtering, "_get_filterlist_items", return_value=["TOKEN"])
+    def test_token_union_only_rebuilt_when_cache_changes(self, get_items):
+        """The combined filter token pattern should only be rebuilt after the filter list cache changes."""
+        self.cog._update_watch_regex_union()
+        self.cog._update_watch_regex_union()
+        get_items.assert_called_once()
+
+        self.bot.filter_list_cache_version += 1
+        self.cog._update_watch_regex_union()
+        self.assertEqual(2, get_items.call_count)
+
+    @autospec(filtering.Filtering, "_get_filterlist_items")
+    async def test_token_filter_with_inline_flag_token(self, get_items):
+        """A token with global inline flags shouldn't change how the other tokens match."""
+        get_items.return_value = ["foo bar", "(?x)baz"]
+
+        result, _ = await self.cog._has_watch_regex_match("foo bar")
+        self.assertEqual("foo bar", result.group())
+
+        result, _ = await self.cog._has_watch_regex_match("ba z")
+        self.assertFalse(result)
+
+        result, _ = await self.cog._has_watch_regex_match("BAZ")
+        self.assertEqual("BAZ", result.group())
+
+    @autospec(filtering.Filtering, "_get_filterlist_items")
+    async def test_domain_filter(self, get_items):
+        """Denylisted domains should be detected in URLs regardless of case, but not in other domains."""
+        cases = (
+            (["evil.com"], "look at https://evil.com/page", True),
+            (["evil.com"], "look at https://www.evil.com", True),
+            (["Evil.COM"], "look at https://EVIL.com/Page", True),
+            (["evil.com"], "look at https://notevil.com", False),
+            (["evil.com"], "look at https://evil.co", False),
+            (["evil.com"], "look at https://eviI.com", False),
+            (["io"], "look at https://example.io", False),
+        )
+
+        for domains, message, expected in cases:
+            with self.subTest(domains=domains, message=message):
+                get_items.return_value = domains
+                self.bot.filter_list_cache_version += 1
+                result, _ = await self.cog._has_urls(message)
+                self.assertEqual(expected, result)
+
+    @autospec(filtering.Filtering, "_get_filterlist_items")
+    async def test_domain_filter_ignores_denylist_without_urls(self, get_items):
+        """The domain denylist shouldn't be read for messages without URLs."""
+        result, _ = await self.cog._has_urls("no links here, just evil.com")
+
+        self.assertFalse(result)
+        get_items.assert_not_called()
+
+    @autospec(filtering.Filtering, "_get_filterlist_items", return_value=["evil.com"])
+    async def test_domain_digests_only_rebuilt_when_cache_changes(self, get_items):
+        """The domain digests should only be rebuilt after the filter list cache changes."""
+        await self.cog._has_urls("https://example.com")
+        await self.cog._has_urls("https://example.com")
+        get_items.assert_called_once()
+
+        self.bot.filter_list_cache_version += 1
+        await self.cog._has_urls("https://example.com")
+        self.assertEqual(2, get_items.call_count)
+
+    def test_trigram_digest_of_substring_is_subset(self):
+        """A substring's digest should only have bits set which are also set for the whole string."""
+        url = "https://www.example.com/some/page"
+        for domain in ("example.com", "www.ex", "com", "e.c", "ab", ""):
+            with self.subTest(domain=domain):
+                domain_digest = self.cog._trigram_digest(domain)
+                self.assertEqual(0, domain_digest & ~self.cog._trigram_digest(url))
+
+        # Strings shorter than a trigram have no bits set, so they can never be skipped.
+        self.assertEqual(0, self.cog._trigram_digest("io"))
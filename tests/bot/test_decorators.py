@@ -2,8 +2,10 @@ import collections
 import unittest
 import unittest.mock
 
+from discord.ext import commands
+
 from bot import constants
-from bot.decorators import in_whitelist
+from bot.decorators import has_any_role_id, in_whitelist
 from bot.utils.checks import InWhitelistCheckFailure
 from tests import helpers
 
@@ -145,3 +147,29 @@ class InWhitelistTests(unittest.TestCase):
             with self.subTest(test_description=test_case.description):
                 with self.assertRaisesRegex(InWhitelistCheckFailure, exception_message):
                     predicate(test_case.ctx)
+
+
+class HasAnyRoleIdTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the `has_any_role_id` check."""
+
+    def setUp(self):
+        """Create the predicate for a pair of allowed roles."""
+        # patch `commands.check` with a no-op lambda that just returns the predicate passed to it
+        with unittest.mock.patch("bot.decorators.commands.check", new=lambda predicate: predicate):
+            self.predicate = has_any_role_id(1, 2)
+
+    async def test_predicate_returns_true_for_member_with_allowed_role(self):
+        """The predicate should return `True` if the author has any of the allowed roles."""
+        author = helpers.MockMember(roles=(helpers.MockRole(id=3), helpers.MockRole(id=2)))
+        self.assertTrue(await self.predicate(helpers.MockContext(author=author)))
+
+    async def test_predicate_raises_missing_any_role_for_member_without_allowed_role(self):
+        """The predicate should raise `MissingAnyRole` if the author has none of the allowed roles."""
+        author = helpers.MockMember(roles=(helpers.MockRole(id=3),))
+        with self.assertRaises(commands.MissingAnyRole):
+            await self.predicate(helpers.MockContext(author=author))
+
+    async def test_predicate_raises_no_private_message_outside_guild(self):
+        """The predicate should raise `NoPrivateMessage` if invoked outside a guild."""
+        with self.assertRaises(commands.NoPrivateMessage):
+            await self.predicate(helpers.MockContext(guild=None))